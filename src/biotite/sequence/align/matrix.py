@@ -7,6 +7,7 @@ __name__ = "biotite.sequence.align"
 __author__ = "Patrick Kunzmann"
 
 import functools
+import itertools
 from pathlib import Path
 import numpy as np
 from biotite.sequence.seqtypes import (
@@ -94,6 +95,9 @@ class SubstitutionMatrix(object):
     ----------
     shape : tuple
         The shape of the substitution matrix.
+    matrix_view : ndarray, shape=(m,n), dtype=np.int32
+        The read-only score matrix, the same object as returned by
+        :meth:`score_matrix()`.
 
     Raises
     ------
@@ -160,9 +164,10 @@ class SubstitutionMatrix(object):
             # inf values would be converted to 2**31,
             # which is probably undesired and gives overflow issues in the alignment
             # functions
+            # Checking the extrema avoids creating boolean temporary arrays
             if (
-                np.any(self._matrix == np.iinfo(np.int32).max) or
-                np.any(self._matrix == np.iinfo(np.int32).min)
+                self._matrix.max() == np.iinfo(np.int32).max or
+                self._matrix.min() == np.iinfo(np.int32).min
             ):  # fmt: skip
                 raise ValueError(
                     "Score values are too large. "
@@ -192,6 +197,20 @@ class SubstitutionMatrix(object):
         """
         return (len(self._alph1), len(self._alph2))
 
+    @property
+    def matrix_view(self):
+        """
+        Get the 2-D :class:`ndarray` containing the score values.
+
+        Returns
+        -------
+        matrix : ndarray, shape=(m,n), dtype=np.int32
+            The symbol code indexed score matrix, the same object as
+            returned by :meth:`score_matrix()`.
+            The array is read-only.
+        """
+        return self._matrix
+
     def get_alphabet1(self):
         """
         Get the first alphabet.
@@ -253,9 +272,10 @@ class SubstitutionMatrix(object):
             True, if both alphabets are identical and the score matrix
             is symmetric, false otherwise.
         """
-        return self._alph1 == self._alph2 and np.array_equal(
-            self._matrix, np.transpose(self._matrix)
-        )
+        # 'Alphabet.__eq__()' already short-circuits for identical objects
+        if self._alph1 != self._alph2:
+            return False
+        return bool(np.array_equal(self._matrix, self._matrix.T))
 
     def get_score_by_code(self, code1, code2):
         """
@@ -274,6 +294,75 @@ class SubstitutionMatrix(object):
         """
         return self._matrix[code1, code2]
 
+    def get_scores_by_codes(self, codes1, codes2):
+        """
+        Get the substitution scores for all combinations of two arrays
+        of symbol codes.
+
+        Parameters
+        ----------
+        codes1 : ndarray, shape=(k,), dtype=int
+            Symbol codes from the first alphabet.
+        codes2 : ndarray, shape=(l,), dtype=int
+            Symbol codes from the second alphabet.
+
+        Returns
+        -------
+        scores : ndarray, shape=(k,l), dtype=np.int32
+            The substitution scores, where ``scores[i, j]`` is the score
+            for ``codes1[i]`` aligned to ``codes2[j]``.
+
+        Examples
+        --------
+
+        >>> matrix = SubstitutionMatrix.std_nucleotide_matrix()
+        >>> alph = matrix.get_alphabet1()
+        >>> print(matrix.get_scores_by_codes(alph.encode_multiple("AC"), alph.encode_multiple("ACG")))
+        [[ 5 -4 -4]
+         [-4  5 -4]]
+        """
+        codes1 = np.asarray(codes1)
+        codes2 = np.asarray(codes2)
+        # Broadcasting the codes against each other directly gives the
+        # (k, l) matrix without materializing all index combinations
+        return self._matrix[codes1[:, np.newaxis], codes2[np.newaxis, :]]
+
+    def score_pairs(self, codes1, codes2):
+        """
+        Get the substitution scores for pairs of symbol codes.
+
+        In contrast to :meth:`get_scores_by_codes()`, only the codes at
+        the same position in both arrays are paired.
+
+        Parameters
+        ----------
+        codes1 : ndarray, shape=(k,), dtype=int
+            Symbol codes from the first alphabet.
+        codes2 : ndarray, shape=(k,), dtype=int
+            Symbol codes from the second alphabet.
+
+        Returns
+        -------
+        scores : ndarray, shape=(k,), dtype=np.int32
+            The substitution scores, where ``scores[i]`` is the score
+            for ``codes1[i]`` aligned to ``codes2[i]``.
+
+        Examples
+        --------
+
+        >>> matrix = SubstitutionMatrix.std_nucleotide_matrix()
+        >>> alph = matrix.get_alphabet1()
+        >>> print(matrix.score_pairs(alph.encode_multiple("ACG"), alph.encode_multiple("AGG")))
+        [ 5 -4  5]
+        """
+        codes1 = np.asarray(codes1)
+        codes2 = np.asarray(codes2)
+        if codes1.shape != codes2.shape:
+            raise IndexError(
+                f"Code arrays have different shapes {codes1.shape} and {codes2.shape}"
+            )
+        return self._matrix[codes1, codes2]
+
     def get_score(self, symbol1, symbol2):
         """
         Get the substitution score of two symbols.
@@ -401,10 +490,12 @@ class SubstitutionMatrix(object):
         pos_sequence1 = PositionalSequence(sequence1)
         pos_sequence2 = PositionalSequence(sequence2)
 
-        pos_score_matrix = self._matrix[
-            tuple(_cartesian_product(sequence1.code, sequence2.code).T)
-        ].reshape(len(sequence1), len(sequence2))
-        pos_matrix = SubstitutionMatrix(
+        pos_score_matrix = np.ascontiguousarray(
+            self.get_scores_by_codes(sequence1.code, sequence2.code)
+        )
+        # The array is only referenced here
+        # -> the new matrix can take it over without a copy
+        pos_matrix = SubstitutionMatrix._from_owned_array(
             pos_sequence1.get_alphabet(),
             pos_sequence2.get_alphabet(),
             pos_score_matrix,
@@ -412,6 +503,27 @@ class SubstitutionMatrix(object):
 
         return pos_matrix, pos_sequence1, pos_sequence2
 
+    def __reduce__(self):
+        # Ship the raw score buffer and skip the validation in the
+        # constructor when unpickling
+        # The buffer has a fixed byte order to be independent of the platform
+        # Additional attributes (e.g. from subclasses) are kept as state
+        state = {
+            key: val
+            for key, val in self.__dict__.items()
+            if key not in ("_alph1", "_alph2", "_matrix")
+        }
+        return (
+            type(self)._from_buffer,
+            (
+                self._alph1,
+                self._alph2,
+                self._matrix.astype("<i4", copy=False).tobytes(),
+                self._matrix.shape,
+            ),
+            state,
+        )
+
     def __repr__(self):
         """Represent SubstitutionMatrix as a string for debugging."""
         return (
@@ -422,11 +534,18 @@ class SubstitutionMatrix(object):
     def __eq__(self, item):
         if not isinstance(item, SubstitutionMatrix):
             return False
+        # Fast path for the same instance, e.g. the cached default matrices
+        if self is item:
+            return True
         if self._alph1 != item.get_alphabet1():
             return False
         if self._alph2 != item.get_alphabet2():
             return False
-        if not np.array_equal(self.score_matrix(), item.score_matrix()):
+        if self._matrix is item._matrix:
+            return True
+        if self._matrix.shape != item._matrix.shape:
+            return False
+        if not np.array_equal(self._matrix, item._matrix):
             return False
         return True
 
@@ -435,18 +554,12 @@ class SubstitutionMatrix(object):
 
     def __str__(self):
         # Create matrix in NCBI format
-        string = " "
-        for symbol in self._alph2:
-            string += f" {str(symbol):>3}"
-        string += "\n"
-        for i, symbol in enumerate(self._alph1):
-            string += f"{str(symbol):>1}"
-            for j in range(len(self._alph2)):
-                string += f" {int(self._matrix[i, j]):>3d}"
-            string += "\n"
-        # Remove terminal line break
-        string = string[:-1]
-        return string
+        header = " " + "".join([f" {str(symbol):>3}" for symbol in self._alph2])
+        rows = [
+            f"{str(symbol):>1}" + "".join([f" {score:>3d}" for score in row])
+            for symbol, row in zip(self._alph1, self._matrix.tolist())
+        ]
+        return "\n".join([header] + rows)
 
     @staticmethod
     def dict_from_str(string):
@@ -469,18 +582,41 @@ class SubstitutionMatrix(object):
         matrix_dict : dict
             A dictionary representing the substitution matrix.
         """
-        lines = [line.strip() for line in string.split("\n")]
-        lines = [line for line in lines if len(line) != 0 and line[0] != "#"]
-        symbols1 = [line.split()[0] for line in lines[1:]]
-        symbols2 = [e for e in lines[0].split()]
-        scores = np.array([line.split()[1:] for line in lines[1:]]).astype(int)
-        scores = np.transpose(scores)
+        # Each line is tokenized exactly once,
+        # 'split()' also takes care of surrounding whitespace
+        tokenized = [line.split() for line in string.split("\n")]
+        tokenized = [row for row in tokenized if len(row) != 0 and row[0][0] != "#"]
+        symbols2 = tokenized[0]
+        body = tokenized[1:]
+        symbols1 = [row[0] for row in body]
+        scores = np.array([row[1:] for row in body], dtype=np.int32)
+
+        return dict(zip(itertools.product(symbols1, symbols2), scores.ravel().tolist()))
+
+    @staticmethod
+    def dict_from_file(file_path):
+        """
+        Create a matrix dictionary from a file in NCBI matrix format.
+
+        Symbols of the first alphabet are taken from the left column,
+        symbols of the second alphabet are taken from the top row.
+
+        The keys of the dictionary consist of tuples containing the
+        aligned symbols and the values are the corresponding scores.
 
-        matrix_dict = {}
-        for i in range(len(symbols1)):
-            for j in range(len(symbols2)):
-                matrix_dict[(symbols1[i], symbols2[j])] = scores[i, j]
-        return matrix_dict
+        Parameters
+        ----------
+        file_path : str or Path
+            The path to the file containing the substitution matrix in
+            NCBI format.
+
+        Returns
+        -------
+        matrix_dict : dict
+            A dictionary representing the substitution matrix.
+        """
+        with open(file_path, "r") as file:
+            return SubstitutionMatrix.dict_from_str(file.read())
 
     @staticmethod
     def dict_from_db(matrix_name):
@@ -501,9 +637,8 @@ class SubstitutionMatrix(object):
         matrix_dict : dict
             A dictionary representing the substitution matrix.
         """
-        filename = _DB_DIR / f"{matrix_name}.mat"
-        with open(filename, "r") as f:
-            return SubstitutionMatrix.dict_from_str(f.read())
+        # Return a copy, as the caller may modify the dictionary
+        return dict(_load_matrix_dict(matrix_name))
 
     @staticmethod
     def list_db():
@@ -515,7 +650,7 @@ class SubstitutionMatrix(object):
         db_list : list
             List of matrix names in the internal database.
         """
-        return [path.stem for path in _DB_DIR.glob("*.mat")]
+        return list(_list_db_names())
 
     @staticmethod
     @functools.cache
@@ -610,22 +745,66 @@ class SubstitutionMatrix(object):
             matrix_dict,
         )
 
+    @classmethod
+    def _from_owned_array(cls, alphabet1, alphabet2, score_matrix):
+        """
+        Create a :class:`SubstitutionMatrix` that takes over the given
+        C-contiguous *int32* score matrix without copying and validating it.
+
+        The array must not be referenced anywhere else, as it is not
+        copied.
+        """
+        matrix = cls.__new__(cls)
+        matrix._alph1 = alphabet1
+        matrix._alph2 = alphabet2
+        matrix._matrix = score_matrix
+        matrix._matrix.setflags(write=False)
+        return matrix
+
+    @classmethod
+    def _from_buffer(cls, alphabet1, alphabet2, data, shape):
+        """
+        Recreate a pickled :class:`SubstitutionMatrix` from its raw score
+        buffer, without the validation in the constructor.
+        """
+        # The array shares the memory with the immutable 'bytes' object,
+        # which is referenced nowhere else
+        # On big-endian platforms the scores are converted into native order
+        score_matrix = (
+            np.frombuffer(data, dtype="<i4").reshape(shape).astype(np.int32, copy=False)
+        )
+        return cls._from_owned_array(alphabet1, alphabet2, score_matrix)
+
     def _fill_with_matrix_dict(self, matrix_dict):
-        self._matrix = np.zeros((len(self._alph1), len(self._alph2)), dtype=np.int32)
-        for i in range(len(self._alph1)):
-            for j in range(len(self._alph2)):
-                sym1 = self._alph1.decode(i)
-                sym2 = self._alph2.decode(j)
-                self._matrix[i, j] = int(matrix_dict[sym1, sym2])
+        # Iterating over an alphabet yields the symbols in code order
+        symbols1 = tuple(self._alph1)
+        symbols2 = tuple(self._alph2)
+        shape = (len(symbols1), len(symbols2))
+        # The known count allows 'fromiter()' to allocate the array only once
+        self._matrix = np.fromiter(
+            (
+                matrix_dict[symbol_pair]
+                for symbol_pair in itertools.product(symbols1, symbols2)
+            ),
+            dtype=np.int32,
+            count=shape[0] * shape[1],
+        ).reshape(shape)
+
+
+@functools.cache
+def _list_db_names():
+    """
+    Get the names of all matrices in the internal database.
+    The directory is scanned only once, as its content does not change.
+    """
+    return tuple(path.stem for path in _DB_DIR.glob("*.mat"))
 
 
-def _cartesian_product(array1, array2):
+@functools.cache
+def _load_matrix_dict(matrix_name):
     """
-    Create all combinations of elements from two arrays.
+    Read the matrix dictionary for the given matrix name from the
+    internal database.
+    The result is cached and hence must not be modified.
     """
-    return np.transpose(
-        [
-            np.repeat(array1, len(array2)),
-            np.tile(array2, len(array1)),
-        ]
-    )
+    return SubstitutionMatrix.dict_from_file(_DB_DIR / f"{matrix_name}.mat")
@@ -2,6 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import pickle
 import numpy as np
 import pytest
 import biotite.sequence as seq
@@ -56,6 +57,66 @@ def test_default_matrices(method_name):
     assert isinstance(matrix, align.SubstitutionMatrix)
 
 
+def test_dict_from_db_cache():
+    """
+    Check if modifying a matrix dictionary from the internal database does
+    not affect the dictionaries returned by subsequent calls, although the
+    parsed matrices are cached.
+    """
+    # Copy the reference to be independent of the returned object
+    ref_matrix_dict = dict(align.SubstitutionMatrix.dict_from_db("PB"))
+
+    matrix_dict = align.SubstitutionMatrix.dict_from_db("PB")
+    matrix_dict[next(iter(matrix_dict))] = 1000
+    matrix_dict["foo", "bar"] = 42
+    assert align.SubstitutionMatrix.dict_from_db("PB") == ref_matrix_dict
+
+    # This function adds entries to the dictionary from the database
+    # (use non-default arguments to bypass its own cache)
+    align.SubstitutionMatrix.std_protein_blocks_matrix(
+        undefined_match=1, undefined_mismatch=-1
+    )
+    assert align.SubstitutionMatrix.dict_from_db("PB") == ref_matrix_dict
+
+
+def test_dict_from_str():
+    """
+    Check if the symbols in the left column are the first symbols and the
+    symbols in the top row are the second symbols in the matrix dictionary
+    for a small asymmetric test case.
+    """
+    string = "\n".join(
+        ["# Comment",
+         "   d  e  f",
+         "a  0  1  2",
+         "",
+         "b  3  4  5"]
+    )  # fmt: skip
+    matrix_dict = align.SubstitutionMatrix.dict_from_str(string)
+    assert matrix_dict == {
+        ("a", "d"): 0, ("a", "e"): 1, ("a", "f"): 2,
+        ("b", "d"): 3, ("b", "e"): 4, ("b", "f"): 5,
+    }  # fmt: skip
+
+
+def test_dict_from_file(tmp_path):
+    """
+    Check if reading a matrix dictionary from a file gives the same result
+    as reading it from the file content.
+    """
+    string = "\n".join(
+        ["   d  e  f",
+         "a  0  1  2",
+         "b  3  4  5"]
+    )  # fmt: skip
+    file_path = tmp_path / "test.mat"
+    file_path.write_text(string)
+
+    assert align.SubstitutionMatrix.dict_from_file(
+        file_path
+    ) == align.SubstitutionMatrix.dict_from_str(string)
+
+
 def test_matrix_str():
     """
     Test conversion of substitution matrix to string via a small
@@ -73,6 +134,37 @@ def test_matrix_str():
     )  # fmt: skip
 
 
+def test_immutable_score_matrix():
+    """
+    Check if modifying the array the substitution matrix was created from
+    does not affect the substitution matrix, even if the array was read-only
+    before.
+    """
+    alph = seq.NucleotideSequence.alphabet_unamb
+    score_matrix = np.zeros((len(alph), len(alph)), dtype=np.int32)
+    score_matrix.setflags(write=False)
+    matrix = align.SubstitutionMatrix(alph, alph, score_matrix)
+
+    score_matrix.setflags(write=True)
+    score_matrix[0, 0] = 99
+
+    assert matrix.score_matrix()[0, 0] == 0
+    assert not matrix.score_matrix().flags.writeable
+
+
+def test_matrix_view():
+    """
+    Check if the score matrix view is the same read-only array as the
+    score matrix and cannot be reassigned.
+    """
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+
+    assert matrix.matrix_view is matrix.score_matrix()
+    assert not matrix.matrix_view.flags.writeable
+    with pytest.raises(AttributeError):
+        matrix.matrix_view = np.zeros(matrix.shape, dtype=np.int32)
+
+
 @pytest.mark.parametrize("seed", range(10))
 def test_as_positional(seed):
     """
@@ -100,3 +192,80 @@ def test_as_positional(seed):
             ref_score = matrix.get_score(sequences[0][i], sequences[1][j])
             test_score = pos_matrix.get_score(pos_sequences[0][i], pos_sequences[1][j])
             assert test_score == ref_score
+
+
+def test_get_scores_by_codes():
+    """
+    Check if the bulk score lookup gives the same scores as the lookup of
+    single symbol code pairs.
+    """
+    np.random.seed(0)
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    codes1 = np.random.randint(0, matrix.shape[0], size=10)
+    codes2 = np.random.randint(0, matrix.shape[1], size=20)
+
+    scores = matrix.get_scores_by_codes(codes1, codes2)
+
+    assert scores.shape == (len(codes1), len(codes2))
+    for i, code1 in enumerate(codes1):
+        for j, code2 in enumerate(codes2):
+            assert scores[i, j] == matrix.get_score_by_code(code1, code2)
+
+
+def test_score_pairs():
+    """
+    Check if the pairwise score lookup gives the same scores as the lookup
+    of single symbol code pairs.
+    """
+    np.random.seed(0)
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    codes1 = np.random.randint(0, matrix.shape[0], size=20)
+    codes2 = np.random.randint(0, matrix.shape[1], size=20)
+
+    scores = matrix.score_pairs(codes1, codes2)
+
+    assert scores.tolist() == [
+        matrix.get_score_by_code(code1, code2) for code1, code2 in zip(codes1, codes2)
+    ]
+
+
+@pytest.mark.parametrize("positional", [False, True])
+def test_pickle(positional):
+    """
+    Check if a substitution matrix is equal to the original matrix after
+    pickling and unpickling and if its score matrix is still read-only.
+    """
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    if positional:
+        matrix, _, _ = matrix.as_positional(
+            seq.ProteinSequence("BIQTITE"), seq.ProteinSequence("IQLITE")
+        )
+
+    unpickled_matrix = pickle.loads(pickle.dumps(matrix))
+
+    assert unpickled_matrix == matrix
+    assert str(unpickled_matrix) == str(matrix)
+    assert not unpickled_matrix.score_matrix().flags.writeable
+
+
+class _AnnotatedSubstitutionMatrix(align.SubstitutionMatrix):
+    def __init__(self, alphabet1, alphabet2, score_matrix, annotation):
+        super().__init__(alphabet1, alphabet2, score_matrix)
+        self.annotation = annotation
+
+
+def test_pickle_subclass():
+    """
+    Check if pickling a subclass of :class:`SubstitutionMatrix` retains
+    the subclass and its additional attributes.
+    """
+    alph = seq.NucleotideSequence.alphabet_unamb
+    matrix = _AnnotatedSubstitutionMatrix(
+        alph, alph, np.identity(len(alph), dtype=int), "identity"
+    )
+
+    unpickled_matrix = pickle.loads(pickle.dumps(matrix))
+
+    assert type(unpickled_matrix) is _AnnotatedSubstitutionMatrix
+    assert unpickled_matrix == matrix
+    assert unpickled_matrix.annotation == "identity"